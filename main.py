@@ -5,9 +5,6 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-from src.config import Config
-from src.github_analyzer import GitHubAnalyzer
-from src.readme_generator import ReadmeGenerator
 from src.utils import (
     setup_logging,
     validate_github_url,
@@ -46,6 +43,12 @@ Examples:
 
     parser.add_argument("--config", help="Path to custom configuration file")
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk caches of GitHub API responses and generated READMEs",
+    )
+
     return parser.parse_args()
 
 
@@ -53,6 +56,12 @@ async def main() -> int:
     """Main application entry point."""
     args = parse_arguments()
 
+    # Heavy modules (aiohttp, dotenv, ...) are imported only after argument
+    # parsing so that --help and usage errors don't pay their import cost.
+    from src.config import Config
+    from src.github_analyzer import GitHubAnalyzer
+    from src.readme_generator import ReadmeGenerator, close_session
+
     # Setup logging
     log_level = logging.DEBUG if args.verbose else logging.INFO
     setup_logging(log_level)
@@ -66,6 +75,8 @@ async def main() -> int:
 
         # Load configuration
         config = Config.load(args.config)
+        if args.no_cache:
+            config.use_cache = False
 
         # Validate OpenRouter API key
         if not config.openrouter_api_key:
@@ -77,12 +88,12 @@ async def main() -> int:
         logger.info(f"Starting README generation for: {args.repo_url}")
 
         # Initialize components
-        analyzer = GitHubAnalyzer(config)
         generator = ReadmeGenerator(config)
 
         # Analyze repository
         logger.info("Analyzing repository structure and content...")
-        repo_data = await analyzer.analyze_repository(args.repo_url)
+        async with GitHubAnalyzer(config) as analyzer:
+            repo_data = await analyzer.analyze_repository(args.repo_url)
 
         if not repo_data:
             logger.error("Failed to analyze repository")
@@ -99,20 +110,21 @@ async def main() -> int:
         # Determine output path. If default is used, place under 'readmes/readme-<repo>.md'
         if args.output == "README.md":
             owner_repo = extract_repo_info(args.repo_url)
+            output_dir = Path("readmes")
+            await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
             if owner_repo:
                 _, repo_name = owner_repo
                 safe_repo_name = sanitize_filename(repo_name)
-                output_dir = Path("readmes")
-                output_dir.mkdir(parents=True, exist_ok=True)
                 output_path = output_dir / f"readme-{safe_repo_name}.md"
             else:
-                output_dir = Path("readmes")
-                output_dir.mkdir(parents=True, exist_ok=True)
                 output_path = output_dir / "readme-output.md"
         else:
             output_path = Path(args.output)
 
-        output_path.write_text(readme_content, encoding="utf-8")
+        # Write off the event loop so slow disks don't block it
+        await asyncio.to_thread(
+            output_path.write_text, readme_content, encoding="utf-8"
+        )
 
         logger.info(f"README successfully generated: {output_path.absolute()}")
         return 0
@@ -125,6 +137,8 @@ async def main() -> int:
         if args.verbose:
             logger.exception("Full traceback:")
         return 1
+    finally:
+        await close_session()
 
 
 if __name__ == "__main__":
@@ -7,17 +7,17 @@ set -e  # Exit on any error
 
 echo "🚀 Setting up README Generator..."
 
-# Check if Python 3.8+ is installed
+# Check if Python 3.10+ is installed
 python_version=$(python3 --version 2>&1 | awk '{print $2}' | cut -d. -f1,2)
-required_version="3.8"
+required_version="3.10"
 
 if ! command -v python3 &> /dev/null; then
-    echo "❌ Python 3 is not installed. Please install Python 3.8 or later."
+    echo "❌ Python 3 is not installed. Please install Python 3.10 or later."
     exit 1
 fi
 
 if [ "$(printf '%s\n' "$required_version" "$python_version" | sort -V | head -n1)" != "$required_version" ]; then
-    echo "❌ Python 3.8+ is required. Found: $python_version"
+    echo "❌ Python 3.10+ is required. Found: $python_version"
     exit 1
 fi
 
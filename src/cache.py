@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Persistent key/value cache stored in a SQLite database.
+
+    The synchronous get/set methods block on disk I/O; coroutines should use
+    aget/aset, which run them in a worker thread.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path).expanduser()
+        self._connection: Optional[sqlite3.Connection] = None
+        # Worker threads share one connection; sqlite3 objects are not thread-safe
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)"
+            )
+        return self._connection
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is not None and row[1] is not None and row[1] < time.time():
+                    with connection:
+                        connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    return None
+        except sqlite3.Error as e:
+            logger.warning(f"Cache lookup failed: {e}")
+            return None
+
+        return pickle.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        """Store value under key, optionally expiring after expire seconds.
+
+        With no expiry the value is kept until overwritten. An expiry of zero
+        or less stores nothing and drops any previous value for key.
+        """
+        now = time.time()
+
+        try:
+            with self._lock, self._connect() as connection:
+                # Prune expired entries so the database does not grow forever
+                connection.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+                if expire is not None and expire <= 0:
+                    connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    return
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (
+                        key,
+                        pickle.dumps(value),
+                        None if expire is None else now + expire,
+                    ),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Cache write failed: {e}")
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """Like get, without blocking the event loop."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        """Like set, without blocking the event loop."""
+        await asyncio.to_thread(self.set, key, value, expire)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -2,10 +2,12 @@ import json
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, FrozenSet, Optional, Any
 import logging
 from dotenv import load_dotenv
 
+from src.utils import json_loads
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables from a .env file in the project root if present.
@@ -21,43 +23,47 @@ class Config:
     openrouter_api_key: str = ""
     model_name: str = "openai/gpt-4o"
     api_base_url: str = "https://openrouter.ai/api/v1"
+    github_token: str = ""  # Optional; raises the GitHub API rate limit
 
     # Analysis Configuration
     max_file_size: int = 100_000  # Maximum file size to analyze in bytes
     max_files: int = 50  # Maximum number of files to analyze
-    supported_extensions: List[str] = field(
-        default_factory=lambda: [
-            ".py",
-            ".js",
-            ".ts",
-            ".jsx",
-            ".tsx",
-            ".java",
-            ".cpp",
-            ".c",
-            ".cs",
-            ".rb",
-            ".go",
-            ".rust",
-            ".rs",
-            ".php",
-            ".swift",
-            ".kt",
-            ".scala",
-            ".md",
-            ".txt",
-            ".yaml",
-            ".yml",
-            ".json",
-            ".toml",
-            ".cfg",
-            ".ini",
-            ".dockerfile",
-            "Dockerfile",
-            "Makefile",
-            ".sh",
-            ".bat",
-        ]
+    max_concurrency: int = 10  # Maximum in-flight GitHub API requests
+    supported_extensions: FrozenSet[str] = field(
+        default_factory=lambda: frozenset(
+            [
+                ".py",
+                ".js",
+                ".ts",
+                ".jsx",
+                ".tsx",
+                ".java",
+                ".cpp",
+                ".c",
+                ".cs",
+                ".rb",
+                ".go",
+                ".rust",
+                ".rs",
+                ".php",
+                ".swift",
+                ".kt",
+                ".scala",
+                ".md",
+                ".txt",
+                ".yaml",
+                ".yml",
+                ".json",
+                ".toml",
+                ".cfg",
+                ".ini",
+                ".dockerfile",
+                "Dockerfile",
+                "Makefile",
+                ".sh",
+                ".bat",
+            ]
+        )
     )
 
     # Generation Configuration
@@ -70,11 +76,20 @@ class Config:
     include_contributing: bool = True
     include_license: bool = True
 
+    # Cache Configuration
+    use_cache: bool = True
+    cache_dir: str = "~/.cache/readme-generator"
+    # Seconds to keep cached GitHub responses and generated content; 0 disables
+    # storing new entries
+    cache_ttl: int = 86_400
+
     # Request Configuration
     request_timeout: int = 30
     max_retries: int = 3
     retry_delay: float = 1.0
+    max_retry_delay: float = 60.0  # Upper bound on server-requested retry waits
     max_tokens: int = 2000  # Max completion tokens for OpenRouter responses
+    max_llm_concurrency: int = 8  # Maximum in-flight OpenRouter requests
 
     @classmethod
     def load(cls, config_path: Optional[str] = None) -> "Config":
@@ -85,14 +100,14 @@ class Config:
         config.openrouter_api_key = os.getenv("OPENROUTER_API_KEY", "")
         config.model_name = os.getenv("MODEL_NAME", config.model_name)
         config.api_base_url = os.getenv("API_BASE_URL", config.api_base_url)
+        config.github_token = os.getenv("GITHUB_TOKEN") or os.getenv("GH_TOKEN", "")
 
         # Load from config file if provided
         if config_path:
             config_file = Path(config_path)
             if config_file.exists():
                 try:
-                    with open(config_file, "r", encoding="utf-8") as f:
-                        file_config = json.load(f)
+                    file_config = json_loads(config_file.read_bytes())
 
                     # Update configuration with file values
                     for key, value in file_config.items():
@@ -106,6 +121,9 @@ class Config:
             else:
                 logger.warning(f"Config file not found: {config_path}")
 
+        # Membership is checked once per file, so keep it a set
+        config.supported_extensions = frozenset(config.supported_extensions)
+
         # Load select overrides from environment variables
         max_tokens_env = os.getenv("MAX_TOKENS")
         if max_tokens_env:
@@ -126,9 +144,11 @@ class Config:
             "openrouter_api_key": "***" if self.openrouter_api_key else "",
             "model_name": self.model_name,
             "api_base_url": self.api_base_url,
+            "github_token": "***" if self.github_token else "",
             "max_file_size": self.max_file_size,
             "max_files": self.max_files,
-            "supported_extensions": self.supported_extensions,
+            "max_concurrency": self.max_concurrency,
+            "supported_extensions": sorted(self.supported_extensions),
             "readme_template": self.readme_template,
             "include_badges": self.include_badges,
             "include_toc": self.include_toc,
@@ -137,17 +157,23 @@ class Config:
             "include_api_docs": self.include_api_docs,
             "include_contributing": self.include_contributing,
             "include_license": self.include_license,
+            "use_cache": self.use_cache,
+            "cache_dir": self.cache_dir,
+            "cache_ttl": self.cache_ttl,
             "request_timeout": self.request_timeout,
             "max_retries": self.max_retries,
             "retry_delay": self.retry_delay,
+            "max_retry_delay": self.max_retry_delay,
             "max_tokens": self.max_tokens,
+            "max_llm_concurrency": self.max_llm_concurrency,
         }
 
     def save(self, config_path: str) -> None:
         """Save configuration to file."""
         config_dict = self.to_dict()
-        # Don't save the API key for security
+        # Don't save the API keys for security
         config_dict.pop("openrouter_api_key")
+        config_dict.pop("github_token")
 
         with open(config_path, "w", encoding="utf-8") as f:
             json.dump(config_dict, f, indent=2)
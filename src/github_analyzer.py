@@ -2,17 +2,42 @@ import asyncio
 import logging
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
-from urllib.parse import urlparse
+from typing import Dict, List, Optional, Set, Tuple, Any
 import aiohttp
-import base64
-import json
 
+from src.cache import DiskCache
 from src.config import Config
 from src.models import RepositoryData, FileData, LanguageStats
+from src.utils import GITHUB_URL_PATTERN, is_binary_file, json_loads
 
 logger = logging.getLogger(__name__)
 
+# Framework names looked for in file contents, matched in a single pass
+_FRAMEWORK_MARKERS = re.compile(r"flask|fastapi", re.IGNORECASE)
+
+# File extension -> language name used for language statistics
+_LANGUAGE_MAP = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".ts": "TypeScript",
+    ".jsx": "React",
+    ".tsx": "React TypeScript",
+    ".java": "Java",
+    ".cpp": "C++",
+    ".c": "C",
+    ".cs": "C#",
+    ".rb": "Ruby",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".php": "PHP",
+    ".swift": "Swift",
+    ".kt": "Kotlin",
+    ".scala": "Scala",
+}
+
+# Files always analyzed regardless of their extension
+_SPECIAL_FILES = frozenset(["README.md", "LICENSE", "Dockerfile", "Makefile"])
+
 
 class GitHubAnalyzer:
     """Analyzes GitHub repositories to extract comprehensive information."""
@@ -20,52 +45,124 @@ class GitHubAnalyzer:
     def __init__(self, config: Config):
         self.config = config
         self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(config.max_concurrency)
+        self._cache: Optional[DiskCache] = (
+            DiskCache(Path(config.cache_dir) / "github.sqlite")
+            if config.use_cache
+            else None
+        )
 
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.request_timeout)
-        )
+        self._get_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            headers = {
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            }
+            if self.config.github_token:
+                headers["Authorization"] = f"Bearer {self.config.github_token}"
+
+            self.session = aiohttp.ClientSession(
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self.config.request_timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=20,
+                    limit_per_host=20,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300,
+                ),
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session and response cache."""
         if self.session:
             await self.session.close()
+            self.session = None
+        if self._cache:
+            self._cache.close()
 
     def _parse_github_url(self, url: str) -> Tuple[str, str]:
         """Parse GitHub URL to extract owner and repository name."""
-        parsed = urlparse(url)
-        path_parts = parsed.path.strip("/").split("/")
+        match = GITHUB_URL_PATTERN.match(url.strip())
 
-        if len(path_parts) < 2:
+        if not match:
             raise ValueError("Invalid GitHub URL format")
 
-        return path_parts[0], path_parts[1]
+        return match.group(1), match.group(2)
 
     async def _get_github_api_data(self, endpoint: str) -> Optional[Dict]:
         """Fetch data from GitHub API."""
+        body = await self._get_github_api_body(endpoint)
+        return json_loads(body) if body is not None else None
+
+    async def _get_github_api_body(
+        self, endpoint: str, accept: Optional[str] = None, immutable: bool = False
+    ) -> Optional[bytes]:
+        """Fetch the raw response body of a GitHub API endpoint.
+
+        Responses of immutable endpoints (content addressed by SHA) are served
+        from the cache without revalidation.
+        """
         url = f"https://api.github.com/{endpoint}"
+        headers = {"Accept": accept} if accept else {}
+
+        cache_key = f"{accept or ''} {url}"
+        cached = await self._cache.aget(cache_key) if self._cache else None
+        if cached and immutable:
+            return cached["body"]
+
+        # Revalidate cached responses; a 304 does not count against the rate limit
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
 
         for attempt in range(self.config.max_retries):
             try:
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
+                session = self._get_session()
+                async with self._semaphore, session.get(
+                    url, headers=headers
+                ) as response:
+                    if response.status == 304 and cached:
+                        return cached["body"]
+                    elif response.status == 200:
+                        body = await response.read()
+                        etag = response.headers.get("ETag")
+                        last_modified = response.headers.get("Last-Modified")
+                        if self._cache and (immutable or etag or last_modified):
+                            await self._cache.aset(
+                                cache_key,
+                                {
+                                    "etag": etag,
+                                    "last_modified": last_modified,
+                                    "body": body,
+                                },
+                                expire=self.config.cache_ttl,
+                            )
+                        return body
                     elif response.status == 404:
                         logger.error(f"Repository not found or not accessible")
                         return None
                     elif response.status == 403:
                         logger.warning("GitHub API rate limit exceeded")
-                        if attempt < self.config.max_retries - 1:
-                            await asyncio.sleep(self.config.retry_delay * (2**attempt))
-                            continue
-                        return None
+                        if attempt == self.config.max_retries - 1:
+                            return None
                     else:
                         logger.warning(f"GitHub API returned status {response.status}")
 
-            except aiohttp.ClientError as e:
-                logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Request failed (attempt {attempt + 1}): {e!r}")
 
             if attempt < self.config.max_retries - 1:
                 await asyncio.sleep(self.config.retry_delay * (2**attempt))
@@ -76,115 +173,128 @@ class GitHubAnalyzer:
         """Get basic repository information."""
         return await self._get_github_api_data(f"repos/{owner}/{repo}")
 
-    async def _get_repository_contents(
-        self, owner: str, repo: str, path: str = ""
+    async def _get_languages(self, owner: str, repo: str) -> Optional[Dict[str, int]]:
+        """Get the byte count per language as computed by GitHub."""
+        return await self._get_github_api_data(f"repos/{owner}/{repo}/languages")
+
+    async def _get_tree(
+        self, owner: str, repo: str, ref: str = "HEAD"
     ) -> Optional[List[Dict]]:
-        """Get repository contents."""
-        endpoint = (
-            f"repos/{owner}/{repo}/contents/{path}"
-            if path
-            else f"repos/{owner}/{repo}/contents"
+        """Get the full recursive file tree of the repository in one request."""
+        data = await self._get_github_api_data(
+            f"repos/{owner}/{repo}/git/trees/{ref}?recursive=1"
         )
-        return await self._get_github_api_data(endpoint)
 
-    async def _get_file_content(
-        self, owner: str, repo: str, path: str
+        if not data:
+            return None
+
+        if data.get("truncated"):
+            logger.warning("Repository tree is too large and was truncated by GitHub")
+
+        return data.get("tree", [])
+
+    async def _get_blob(
+        self, owner: str, repo: str, sha: str, path: str
     ) -> Optional[str]:
-        """Get individual file content."""
-        data = await self._get_github_api_data(f"repos/{owner}/{repo}/contents/{path}")
+        """Get individual file content by blob SHA."""
+        # Ask for the raw bytes rather than the base64 JSON envelope
+        body = await self._get_github_api_body(
+            f"repos/{owner}/{repo}/git/blobs/{sha}",
+            accept="application/vnd.github.raw+json",
+            immutable=True,
+        )
 
-        if data and data.get("type") == "file" and data.get("content"):
-            try:
-                # Decode base64 content
-                content = base64.b64decode(data["content"]).decode("utf-8")
-                return content
-            except (UnicodeDecodeError, ValueError) as e:
-                logger.warning(f"Failed to decode file {path}: {e}")
+        if body is not None:
+            # A NUL byte near the start means binary content we can't use
+            if b"\0" in body[:1024]:
+                logger.debug(f"Skipping binary file {path}")
                 return None
 
+            # Binary files were filtered above; stray invalid bytes in text
+            # files (e.g. Latin-1 comments) are replaced rather than fatal.
+            return body.decode("utf-8", errors="replace")
+
         return None
 
     async def _analyze_directory_structure(
-        self, owner: str, repo: str, path: str = "", level: int = 0, max_level: int = 3
+        self, owner: str, repo: str, max_level: int = 3
     ) -> List[FileData]:
-        """Recursively analyze directory structure."""
-        if level > max_level:
-            return []
-
-        files = []
-        contents = await self._get_repository_contents(owner, repo, path)
-
-        if not contents:
-            return files
+        """Analyze the repository tree and fetch the contents of relevant files."""
+        tree = await self._get_tree(owner, repo)
 
-        for item in contents:
-            if len(files) >= self.config.max_files:
-                break
+        if not tree:
+            return []
 
-            file_path = item["path"]
-            file_name = item["name"]
+        # Filter the tree locally; only the blobs we keep cost a request.
+        selected = []
+        for node in tree:
+            if node.get("type") != "blob" or node["path"].count("/") > max_level:
+                continue
+
+            file_name = node["path"].rsplit("/", 1)[-1]
+            file_extension = Path(file_name).suffix.lower()
+
+            if (
+                file_extension in self.config.supported_extensions
+                or file_name in _SPECIAL_FILES
+            ) and not is_binary_file(file_name):
+                if node.get("size", 0) <= self.config.max_file_size:
+                    selected.append((node, file_name, file_extension))
+
+        # Downloads are bounded by the request semaphore. Files that cannot be
+        # read are skipped, and anything still pending once max_files files
+        # have been collected is cancelled.
+        tasks = [
+            asyncio.create_task(self._get_blob(owner, repo, node["sha"], node["path"]))
+            for node, _, _ in selected
+        ]
 
-            if item["type"] == "dir":
-                # Recursively analyze subdirectories
-                subfiles = await self._analyze_directory_structure(
-                    owner, repo, file_path, level + 1, max_level
+        files = []
+        try:
+            for (node, file_name, file_extension), task in zip(selected, tasks):
+                try:
+                    content = await task
+                except Exception as e:
+                    # One unreadable file must not discard the rest
+                    logger.warning(f"Failed to fetch {node['path']}: {e!r}")
+                    continue
+                if content is None:
+                    continue
+
+                files.append(
+                    FileData(
+                        path=node["path"],
+                        name=file_name,
+                        extension=file_extension,
+                        size=node.get("size", 0),
+                        content=content,
+                    )
                 )
-                files.extend(subfiles)
-            else:
-                # Analyze file
-                file_extension = Path(file_name).suffix.lower()
-
-                if file_extension in self.config.supported_extensions or file_name in [
-                    "README.md",
-                    "LICENSE",
-                    "Dockerfile",
-                    "Makefile",
-                ]:
-
-                    file_size = item.get("size", 0)
-                    if file_size <= self.config.max_file_size:
-                        content = await self._get_file_content(owner, repo, file_path)
-
-                        files.append(
-                            FileData(
-                                path=file_path,
-                                name=file_name,
-                                extension=file_extension,
-                                size=file_size,
-                                content=content or "",
-                            )
-                        )
+                if len(files) >= self.config.max_files:
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Mark failures of unconsumed tasks as retrieved
+                    task.exception()
 
         return files
 
     def _analyze_languages(self, files: List[FileData]) -> LanguageStats:
         """Analyze programming languages used in the repository."""
-        language_map = {
-            ".py": "Python",
-            ".js": "JavaScript",
-            ".ts": "TypeScript",
-            ".jsx": "React",
-            ".tsx": "React TypeScript",
-            ".java": "Java",
-            ".cpp": "C++",
-            ".c": "C",
-            ".cs": "C#",
-            ".rb": "Ruby",
-            ".go": "Go",
-            ".rs": "Rust",
-            ".php": "PHP",
-            ".swift": "Swift",
-            ".kt": "Kotlin",
-            ".scala": "Scala",
-        }
-
         language_counts = {}
         total_lines = 0
 
         for file_data in files:
-            if file_data.extension in language_map:
-                language = language_map[file_data.extension]
-                lines = len(file_data.content.splitlines()) if file_data.content else 0
+            if file_data.extension in _LANGUAGE_MAP:
+                language = _LANGUAGE_MAP[file_data.extension]
+                # Count newlines instead of materializing a list of lines
+                content = file_data.content
+                lines = (
+                    content.count("\n") + (not content.endswith("\n")) if content else 0
+                )
                 language_counts[language] = language_counts.get(language, 0) + lines
                 total_lines += lines
 
@@ -196,10 +306,24 @@ class GitHubAnalyzer:
 
         return LanguageStats(languages=language_percentages, total_lines=total_lines)
 
-    def _detect_project_type(self, files: List[FileData]) -> str:
+    def _language_stats_from_bytes(
+        self, language_bytes: Dict[str, int]
+    ) -> LanguageStats:
+        """Convert GitHub's per-language byte counts into language statistics."""
+        total_bytes = sum(language_bytes.values())
+
+        language_percentages = {}
+        if total_bytes > 0:
+            for language, size in language_bytes.items():
+                language_percentages[language] = (size / total_bytes) * 100
+
+        # GitHub reports bytes rather than lines
+        return LanguageStats(languages=language_percentages, total_lines=0)
+
+    def _detect_project_type(
+        self, files: List[FileData], file_names: Set[str], file_extensions: Set[str]
+    ) -> str:
         """Detect the type of project based on files."""
-        file_names = {f.name.lower() for f in files}
-        file_extensions = {f.extension for f in files}
 
         # Web frameworks
         if "package.json" in file_names:
@@ -213,9 +337,20 @@ class GitHubAnalyzer:
         if "requirements.txt" in file_names or "pyproject.toml" in file_names:
             if "manage.py" in file_names:
                 return "Django Application"
-            elif any("flask" in f.content.lower() for f in files if f.content):
+
+            markers = set()
+            for f in files:
+                if f.content:
+                    markers.update(
+                        m.group(0).lower()
+                        for m in _FRAMEWORK_MARKERS.finditer(f.content)
+                    )
+                    if "flask" in markers:
+                        break
+
+            if "flask" in markers:
                 return "Flask Application"
-            elif any("fastapi" in f.content.lower() for f in files if f.content):
+            elif "fastapi" in markers:
                 return "FastAPI Application"
             return "Python Project"
 
@@ -241,33 +376,49 @@ class GitHubAnalyzer:
             owner, repo_name = self._parse_github_url(repo_url)
             logger.info(f"Analyzing repository: {owner}/{repo_name}")
 
-            # Create session if not exists
-            if not self.session:
-                self.session = aiohttp.ClientSession(
-                    timeout=aiohttp.ClientTimeout(total=self.config.request_timeout)
-                )
+            # Fetch repository information, structure and languages concurrently
+            repo_info, files, language_bytes = await asyncio.gather(
+                self._get_repository_info(owner, repo_name),
+                self._analyze_directory_structure(owner, repo_name),
+                self._get_languages(owner, repo_name),
+                return_exceptions=True,
+            )
 
-            # Get repository information
-            repo_info = await self._get_repository_info(owner, repo_name)
+            # Only the repository information is required; degrade gracefully
+            if isinstance(repo_info, Exception):
+                logger.error(f"Failed to fetch repository information: {repo_info}")
+                return None
             if not repo_info:
                 return None
 
-            # Analyze repository structure
-            files = await self._analyze_directory_structure(owner, repo_name)
+            if isinstance(files, Exception):
+                logger.warning(f"Failed to analyze repository structure: {files}")
+                files = []
 
-            # Analyze languages
-            language_stats = self._analyze_languages(files)
+            if isinstance(language_bytes, Exception):
+                logger.warning(f"Failed to fetch language statistics: {language_bytes}")
+                language_bytes = None
 
-            # Detect project type
-            project_type = self._detect_project_type(files)
+            # Analyze languages, counting lines locally only if GitHub has no data
+            if language_bytes:
+                language_stats = self._language_stats_from_bytes(language_bytes)
+            else:
+                language_stats = self._analyze_languages(files)
+
+            # Find important files and collect names/extensions in one pass
+            readme_file = license_file = None
+            file_names = set()
+            file_extensions = set()
+            for f in files:
+                file_names.add(f.name_lower)
+                file_extensions.add(f.ext_lower)
+                if readme_file is None and f.name_lower.startswith("readme"):
+                    readme_file = f
+                if license_file is None and f.name_lower.startswith("license"):
+                    license_file = f
 
-            # Find important files
-            readme_file = next(
-                (f for f in files if f.name.lower().startswith("readme")), None
-            )
-            license_file = next(
-                (f for f in files if f.name.lower().startswith("license")), None
-            )
+            # Detect project type
+            project_type = self._detect_project_type(files, file_names, file_extensions)
 
             return RepositoryData(
                 name=repo_info["name"],
@@ -282,6 +433,7 @@ class GitHubAnalyzer:
                 open_issues=repo_info.get("open_issues_count", 0),
                 created_at=repo_info.get("created_at", ""),
                 updated_at=repo_info.get("updated_at", ""),
+                pushed_at=repo_info.get("pushed_at", ""),
                 project_type=project_type,
                 files=files,
                 readme_content=readme_file.content if readme_file else "",
@@ -294,7 +446,3 @@ class GitHubAnalyzer:
         except Exception as e:
             logger.error(f"Failed to analyze repository: {e}")
             return None
-        finally:
-            if self.session:
-                await self.session.close()
-                self.session = None
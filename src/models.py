@@ -1,8 +1,30 @@
-from dataclasses import dataclass
+import hashlib
+import heapq
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 
-
-@dataclass
+# Extensions and names used to classify repository files
+_CONFIG_EXTENSIONS = frozenset(
+    [
+        ".json",
+        ".yaml",
+        ".yml",
+        ".toml",
+        ".ini",
+        ".cfg",
+        "dockerfile",
+        "makefile",
+        ".env",
+    ]
+)
+_CONFIG_NAMES = frozenset(["dockerfile", "makefile"])
+_DOC_EXTENSIONS = frozenset([".md", ".txt", ".rst"])
+
+# Number of files shown in the file structure summary
+_FILE_STRUCTURE_LIMIT = 30
+
+
+@dataclass(slots=True)
 class FileData:
     """Represents a file in the repository."""
 
@@ -12,16 +34,24 @@ class FileData:
     size: int
     content: str
 
+    # Lowercased copies used by name/extension lookups
+    name_lower: str = field(init=False, repr=False)
+    ext_lower: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.name_lower = self.name.lower()
+        self.ext_lower = self.extension.lower()
+
 
-@dataclass
+@dataclass(slots=True)
 class LanguageStats:
     """Statistics about programming languages used."""
 
     languages: Dict[str, float]  # Language name -> percentage
-    total_lines: int
+    total_lines: int  # 0 when percentages come from GitHub's byte counts
 
 
-@dataclass
+@dataclass(slots=True)
 class RepositoryData:
     """Complete repository analysis data."""
 
@@ -44,6 +74,7 @@ class RepositoryData:
     # Timestamps
     created_at: str
     updated_at: str
+    pushed_at: str
 
     # Analysis results
     project_type: str
@@ -58,50 +89,157 @@ class RepositoryData:
     has_issues: bool
     has_projects: bool
 
+    # Files indexed by lowercased name (first occurrence wins)
+    _by_name_lower: Dict[str, FileData] = field(init=False, repr=False, compare=False)
+
+    # Lazily computed results of the accessors below
+    _main_language: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _config_files: Optional[List[FileData]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _documentation_files: Optional[List[FileData]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _language_summary: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _file_structure: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._by_name_lower = {}
+        for f in self.files:
+            self._by_name_lower.setdefault(f.name_lower, f)
+
     def get_files_by_extension(self, extension: str) -> List[FileData]:
         """Get all files with a specific extension."""
         return [f for f in self.files if f.extension == extension]
 
     def get_file_by_name(self, name: str) -> Optional[FileData]:
         """Get a file by its name."""
-        return next((f for f in self.files if f.name.lower() == name.lower()), None)
+        return self._by_name_lower.get(name.lower())
 
     def get_main_language(self) -> str:
         """Get the primary programming language."""
-        if self.languages.languages:
-            return max(self.languages.languages.items(), key=lambda x: x[1])[0]
-        return self.language or "Unknown"
+        if self._main_language is None:
+            if self.languages.languages:
+                self._main_language = max(
+                    self.languages.languages.items(), key=lambda x: x[1]
+                )[0]
+            else:
+                self._main_language = self.language or "Unknown"
+        return self._main_language
 
     def has_file(self, filename: str) -> bool:
         """Check if repository contains a specific file."""
-        return any(f.name.lower() == filename.lower() for f in self.files)
+        return filename.lower() in self._by_name_lower
 
-    def get_config_files(self) -> List[FileData]:
-        """Get configuration files."""
-        config_patterns = [
-            ".json",
-            ".yaml",
-            ".yml",
-            ".toml",
-            ".ini",
-            ".cfg",
-            "dockerfile",
-            "makefile",
-            ".env",
-        ]
-        config_files = []
+    def _classify_files(self) -> None:
+        """Sort files into configuration and documentation files in one pass."""
+        self._config_files = []
+        self._documentation_files = []
 
         for file_data in self.files:
             if (
-                file_data.extension.lower() in config_patterns
-                or file_data.name.lower() in ["dockerfile", "makefile"]
-                or file_data.name.lower().startswith(".env")
+                file_data.ext_lower in _CONFIG_EXTENSIONS
+                or file_data.name_lower in _CONFIG_NAMES
+                or file_data.name_lower.startswith(".env")
             ):
-                config_files.append(file_data)
+                self._config_files.append(file_data)
+            if file_data.ext_lower in _DOC_EXTENSIONS:
+                self._documentation_files.append(file_data)
 
-        return config_files
+    def get_config_files(self) -> List[FileData]:
+        """Get configuration files."""
+        if self._config_files is None:
+            self._classify_files()
+        return self._config_files
 
     def get_documentation_files(self) -> List[FileData]:
         """Get documentation files."""
-        doc_extensions = [".md", ".txt", ".rst"]
-        return [f for f in self.files if f.extension.lower() in doc_extensions]
+        if self._documentation_files is None:
+            self._classify_files()
+        return self._documentation_files
+
+    def get_language_summary(self) -> str:
+        """Get language percentages as a markdown list, most used first."""
+        if self._language_summary is None:
+            self._language_summary = "\n".join(
+                f"- {lang}: {percent:.1f}%"
+                for lang, percent in sorted(
+                    self.languages.languages.items(),
+                    key=lambda x: x[1],
+                    reverse=True,
+                )
+            )
+        return self._language_summary
+
+    def get_file_structure(self) -> str:
+        """Get an indented tree of the most prominent files in the repository."""
+        if self._file_structure is None:
+            structure = {}
+
+            # Prefer shallow files, then larger ones, over arbitrary tree order
+            prominent_files = heapq.nsmallest(
+                _FILE_STRUCTURE_LIMIT,
+                self.files,
+                key=lambda f: (f.path.count("/"), -f.size),
+            )
+
+            for file_data in prominent_files:
+                parts = file_data.path.split("/")
+                current = structure
+
+                for part in parts[:-1]:  # Directories
+                    current = current.setdefault(part, {})
+
+                # File
+                current[parts[-1]] = f"({file_data.size} bytes)"
+
+            self._file_structure = _format_structure(structure)
+        return self._file_structure
+
+    def fingerprint(self) -> str:
+        """Get a digest of the analysis data that determines the generated README."""
+        digest = hashlib.blake2b(digest_size=16)
+        for value in (
+            self.full_name,
+            self.pushed_at,
+            self.description,
+            self.project_type,
+            self.stars,
+            self.forks,
+            self.open_issues,
+        ):
+            digest.update(f"{value}\0".encode("utf-8"))
+
+        # File manifest; content changes are covered by pushed_at, which
+        # GitHub bumps on every push (updated_at is not reliably bumped)
+        for file_data in self.files:
+            digest.update(f"{file_data.path}\0{file_data.size}\0".encode("utf-8"))
+
+        return digest.hexdigest()
+
+
+def _format_structure(structure: Dict[str, Any]) -> str:
+    """Format a nested directory dict as indented text."""
+    lines = []
+    # Depth-first walk with an explicit stack of sorted entry iterators;
+    # every line is appended to one buffer and joined once at the end.
+    stack = [iter(sorted(structure.items()))]
+
+    while stack:
+        prefix = "  " * (len(stack) - 1)
+        for key, value in stack[-1]:
+            if isinstance(value, dict):
+                lines.append(f"{prefix}{key}/")
+                stack.append(iter(sorted(value.items())))
+                break
+            lines.append(f"{prefix}{key} {value}")
+        else:
+            stack.pop()
+
+    return "\n".join(lines)
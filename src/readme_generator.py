@@ -1,74 +1,260 @@
 import asyncio
-import json
+import hashlib
+import io
 import logging
-from typing import Dict, List, Optional, Any
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Any
 import aiohttp
 
+from src.cache import DiskCache
 from src.config import Config
 from src.models import RepositoryData
+from src.utils import collapse_blank_lines, json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = (
+    "You are an expert technical writer specializing in creating comprehensive, "
+    "professional README.md files for software projects. You analyze code "
+    "repositories and generate clear, well-structured documentation that helps "
+    "users understand, install, and use the software effectively."
+)
+
+# Invariant part of the user prompt. It is sent ahead of the repository data
+# so that it forms a cacheable prefix shared by every request.
+ANALYSIS_INSTRUCTIONS = """\
+You are an expert technical writer tasked with creating a comprehensive README.md file for a GitHub repository.
+
+## Requirements:
+Please generate a comprehensive README.md that includes:
+
+1. **Project Title and Description**: Clear, engaging description
+2. **Badges**: Relevant badges for language, license, issues, etc.
+3. **Table of Contents**: Well-organized navigation
+4. **Features**: Key features and capabilities
+5. **Installation**: Step-by-step installation instructions
+6. **Usage**: Code examples and usage instructions
+7. **API Documentation**: If applicable, document key functions/classes
+8. **Configuration**: Environment variables and config options
+9. **Contributing**: Guidelines for contributors
+10. **Testing**: How to run tests
+11. **Deployment**: Deployment instructions if applicable
+12. **License**: License information
+13. **Acknowledgments**: Credits and thanks
+
+## Guidelines:
+- Write in clear, professional English
+- Use proper Markdown formatting
+- Include realistic code examples based on the actual code
+- Make installation instructions specific to the project type
+- Focus on practical information that helps users and contributors
+- Ensure the content is accurate based on the repository analysis
+- Use appropriate technical terminology for the project domain
+- Include relevant links and references
+"""
+
+# Stable identifier for the invariant prompt prefix, used by provider-side caching
+PROMPT_CACHE_KEY = hashlib.sha256(
+    (SYSTEM_PROMPT + ANALYSIS_INSTRUCTIONS).encode("utf-8")
+).hexdigest()[:16]
+
+
+# Syntax-highlighting identifiers for fenced code samples
+_LANG_MAP = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".jsx": "jsx",
+    ".tsx": "tsx",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".cs": "csharp",
+    ".rb": "ruby",
+    ".go": "go",
+    ".rs": "rust",
+    ".php": "php",
+    ".swift": "swift",
+    ".kt": "kotlin",
+    ".scala": "scala",
+    ".json": "json",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toml": "toml",
+    ".xml": "xml",
+    ".html": "html",
+    ".css": "css",
+    ".sh": "bash",
+    ".bat": "batch",
+    ".md": "markdown",
+}
+
+# Sampling parameters sent with every completion request
+TEMPERATURE = 0.3
+TOP_P = 0.9
+
+# First top-level markdown heading in a document
+_TITLE_RE = re.compile(r"^(# .*)$", re.MULTILINE)
+
+# Statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _RateLimiter:
+    """Pauses requests while OpenRouter reports an exhausted rate limit."""
+
+    def __init__(self):
+        self._resume_at = 0.0
+
+    def update(self, headers) -> None:
+        """Record the rate-limit state reported by a response."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        try:
+            if int(remaining) > 0:
+                return
+            reset_at = float(reset)
+        except ValueError:
+            return
+
+        # The reset time is a Unix timestamp, in milliseconds on OpenRouter
+        if reset_at > 1e12:
+            reset_at /= 1000
+        self._resume_at = max(self._resume_at, reset_at)
+
+    async def wait(self) -> None:
+        """Sleep until the rate-limit window resets, if it is exhausted."""
+        delay = self._resume_at - time.time()
+        if delay > 0:
+            logger.info(f"OpenRouter rate limit reached, waiting {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+_RATE_LIMITER = _RateLimiter()
+
+# Process-wide session so that every generator reuses warm connections. A
+# session is bound to the event loop it was created on, so it is recreated
+# when used from a different loop (e.g. a second asyncio.run()).
+_SESSION: Optional[aiohttp.ClientSession] = None
+_SESSION_LOOP: Optional[asyncio.AbstractEventLoop] = None
+# Generators currently inside "async with"; the last one out closes the session
+_SESSION_USERS = 0
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Return the shared OpenRouter session, creating it on first use."""
+    global _SESSION, _SESSION_LOOP
+
+    # Nothing is awaited between the check and the assignment, so concurrent
+    # callers on one loop cannot both create a session.
+    loop = asyncio.get_running_loop()
+    if _SESSION is None or _SESSION.closed or _SESSION_LOOP is not loop:
+        _SESSION = aiohttp.ClientSession(
+            headers={
+                "HTTP-Referer": "https://github.com/readme-generator",
+                "X-Title": "README Generator",
+            },
+            connector=aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=64,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+            ),
+        )
+        _SESSION_LOOP = loop
+    return _SESSION
+
+
+async def close_session() -> None:
+    """Close the shared OpenRouter session, if one was opened."""
+    global _SESSION, _SESSION_LOOP
+
+    session, loop = _SESSION, _SESSION_LOOP
+    _SESSION = _SESSION_LOOP = None
+
+    # A session left behind by a finished loop can no longer be closed from here
+    if session is not None and loop is asyncio.get_running_loop():
+        await session.close()
+
 
 class ReadmeGenerator:
     """Generates README.md content using AI analysis."""
 
     def __init__(self, config: Config):
         self.config = config
-        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(config.max_llm_concurrency)
+        self._cache: Optional[DiskCache] = (
+            DiskCache(Path(config.cache_dir) / "llm.sqlite")
+            if config.use_cache
+            else None
+        )
 
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.request_timeout)
-        )
+        global _SESSION_USERS
+        _SESSION_USERS += 1
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
-            await self.session.close()
+        global _SESSION_USERS
+        _SESSION_USERS -= 1
 
-    def _create_analysis_prompt(self, repo_data: RepositoryData) -> str:
-        """Create a comprehensive prompt for AI analysis."""
+        # The HTTP session is shared; release it once no generator uses it
+        if _SESSION_USERS == 0:
+            await close_session()
 
-        # Prepare file structure summary
-        file_structure = self._create_file_structure_summary(repo_data.files)
+        if self._cache:
+            self._cache.close()
+
+    def _create_analysis_prompt(self, repo_data: RepositoryData) -> str:
+        """Create the repository-specific part of the analysis prompt."""
 
         # Prepare code samples
         code_samples = self._create_code_samples(repo_data)
 
-        # Prepare language statistics
-        lang_stats = ""
-        if repo_data.languages.languages:
-            lang_stats = "\n".join(
-                [
-                    f"- {lang}: {percent:.1f}%"
-                    for lang, percent in sorted(
-                        repo_data.languages.languages.items(),
-                        key=lambda x: x[1],
-                        reverse=True,
-                    )
-                ]
-            )
-
+        # Most stable fields first, volatile counters last, to maximize the
+        # prefix shared between runs on the same repository
         prompt = f"""
-You are an expert technical writer tasked with creating a comprehensive README.md file for a GitHub repository.
-
 ## Repository Information:
 - Name: {repo_data.name}
 - Description: {repo_data.description}
 - Project Type: {repo_data.project_type}
 - Main Language: {repo_data.get_main_language()}
-- Stars: {repo_data.stars}
-- Forks: {repo_data.forks}
-- Open Issues: {repo_data.open_issues}
 
 ## Language Statistics:
-{lang_stats}
+{repo_data.get_language_summary()}
 
 ## File Structure:
-{file_structure}
+{repo_data.get_file_structure()}
 
 ## Key Code Samples:
 {code_samples}
@@ -79,69 +265,15 @@ You are an expert technical writer tasked with creating a comprehensive README.m
 ## License Information:
 {repo_data.license_content[:500] if repo_data.license_content else "No license file found"}
 
-## Requirements:
-Please generate a comprehensive README.md that includes:
-
-1. **Project Title and Description**: Clear, engaging description
-2. **Badges**: Relevant badges for language, license, issues, etc.
-3. **Table of Contents**: Well-organized navigation
-4. **Features**: Key features and capabilities
-5. **Installation**: Step-by-step installation instructions
-6. **Usage**: Code examples and usage instructions
-7. **API Documentation**: If applicable, document key functions/classes
-8. **Configuration**: Environment variables and config options
-9. **Contributing**: Guidelines for contributors
-10. **Testing**: How to run tests
-11. **Deployment**: Deployment instructions if applicable
-12. **License**: License information
-13. **Acknowledgments**: Credits and thanks
-
-## Guidelines:
-- Write in clear, professional English
-- Use proper Markdown formatting
-- Include realistic code examples based on the actual code
-- Make installation instructions specific to the project type
-- Focus on practical information that helps users and contributors
-- Ensure the content is accurate based on the repository analysis
-- Use appropriate technical terminology for the project domain
-- Include relevant links and references
+## Repository Activity:
+- Stars: {repo_data.stars}
+- Forks: {repo_data.forks}
+- Open Issues: {repo_data.open_issues}
 
 Generate a complete, professional README.md file:
 """
         return prompt
 
-    def _create_file_structure_summary(self, files: List) -> str:
-        """Create a summary of the file structure."""
-        structure = {}
-
-        for file_data in files[:30]:  # Limit to first 30 files
-            parts = file_data.path.split("/")
-            current = structure
-
-            for part in parts[:-1]:  # Directories
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-
-            # File
-            current[parts[-1]] = f"({file_data.size} bytes)"
-
-        return self._format_structure(structure)
-
-    def _format_structure(self, structure: Dict, indent: int = 0) -> str:
-        """Format the file structure as text."""
-        lines = []
-        prefix = "  " * indent
-
-        for key, value in sorted(structure.items()):
-            if isinstance(value, dict):
-                lines.append(f"{prefix}{key}/")
-                lines.append(self._format_structure(value, indent + 1))
-            else:
-                lines.append(f"{prefix}{key} {value}")
-
-        return "\n".join(lines)
-
     def _create_code_samples(self, repo_data: RepositoryData) -> str:
         """Create relevant code samples from the repository."""
         samples = []
@@ -181,105 +313,185 @@ Generate a complete, professional README.md file:
 
     def _get_language_for_extension(self, extension: str) -> str:
         """Get the appropriate language identifier for syntax highlighting."""
-        lang_map = {
-            ".py": "python",
-            ".js": "javascript",
-            ".ts": "typescript",
-            ".jsx": "jsx",
-            ".tsx": "tsx",
-            ".java": "java",
-            ".cpp": "cpp",
-            ".c": "c",
-            ".cs": "csharp",
-            ".rb": "ruby",
-            ".go": "go",
-            ".rs": "rust",
-            ".php": "php",
-            ".swift": "swift",
-            ".kt": "kotlin",
-            ".scala": "scala",
-            ".json": "json",
-            ".yaml": "yaml",
-            ".yml": "yaml",
-            ".toml": "toml",
-            ".xml": "xml",
-            ".html": "html",
-            ".css": "css",
-            ".sh": "bash",
-            ".bat": "batch",
-            ".md": "markdown",
-        }
-        return lang_map.get(extension.lower(), "")
+        return _LANG_MAP.get(
+            extension if extension.islower() else extension.lower(), ""
+        )
+
+    def _create_messages(self, prompt: str) -> List[Dict[str, Any]]:
+        """Build chat messages with the invariant instructions ahead of the prompt."""
+        # Anthropic models only cache prompts that are explicitly marked, so
+        # place a cache breakpoint right after the static instructions
+        if "anthropic/" in self.config.model_name:
+            return [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": ANALYSIS_INSTRUCTIONS,
+                            "cache_control": {"type": "ephemeral"},
+                        },
+                        {"type": "text", "text": prompt},
+                    ],
+                },
+            ]
+
+        # Other providers cache matching prefixes automatically
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": ANALYSIS_INSTRUCTIONS + prompt},
+        ]
+
+    def _response_cache_key(self, prompt: str) -> str:
+        """Build the cache key for a completion of the given prompt."""
+        return hashlib.sha256(
+            "\0".join([*self._generation_settings(), prompt]).encode("utf-8")
+        ).hexdigest()
+
+    def _generation_settings(self) -> List[str]:
+        """Get the request settings that change the model's output."""
+        return [
+            self.config.model_name,
+            PROMPT_CACHE_KEY,
+            str(self.config.max_tokens),
+            str(TEMPERATURE),
+            str(TOP_P),
+        ]
+
+    def _readme_cache_key(self, repo_data: RepositoryData) -> str:
+        """Build the cache key for the finished README of a repository."""
+        return "\0".join(
+            [
+                "readme",
+                *self._generation_settings(),
+                str(self.config.include_badges),
+                repo_data.fingerprint(),
+            ]
+        )
 
     async def _call_openrouter_api(self, prompt: str) -> Optional[str]:
         """Call the OpenRouter API to generate README content."""
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.config.request_timeout)
-            )
+        # Identical requests for the same model reuse the previous completion
+        cache_key = self._response_cache_key(prompt)
+        if self._cache:
+            cached = await self._cache.aget(cache_key)
+            if cached:
+                logger.info("Using cached README content")
+                return cached
+
+        buffer = io.StringIO()
+        async for chunk in self._stream_openrouter_api(prompt):
+            buffer.write(chunk)
+
+        content = buffer.getvalue().strip()
+        if not content:
+            return None
 
+        if self._cache:
+            await self._cache.aset(cache_key, content, expire=self.config.cache_ttl)
+        return content
+
+    async def _stream_openrouter_api(self, prompt: str) -> AsyncIterator[str]:
+        """Stream README content from the OpenRouter API as it is generated."""
+        session = await _get_session()
         headers = {
             "Authorization": f"Bearer {self.config.openrouter_api_key}",
             "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/readme-generator",
-            "X-Title": "README Generator",
         }
+        timeout = aiohttp.ClientTimeout(total=self.config.request_timeout)
 
         payload = {
             "model": self.config.model_name,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are an expert technical writer specializing in creating comprehensive, professional README.md files for software projects. You analyze code repositories and generate clear, well-structured documentation that helps users understand, install, and use the software effectively.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+            "messages": self._create_messages(prompt),
             "max_tokens": int(self.config.max_tokens),
-            "temperature": 0.3,
-            "top_p": 0.9,
+            "temperature": TEMPERATURE,
+            "top_p": TOP_P,
+            "prompt_cache_key": PROMPT_CACHE_KEY,
+            "stream": True,
         }
+        # Serialize once up front rather than on every retry
+        body = json_dumps(payload)
 
+        streamed = False
         for attempt in range(self.config.max_retries):
+            delay = self.config.retry_delay * (2**attempt)
+
             try:
-                async with self.session.post(
-                    f"{self.config.api_base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                ) as response:
-
-                    if response.status == 200:
-                        result = await response.json()
-
-                        if "choices" in result and result["choices"]:
-                            content = result["choices"][0]["message"]["content"]
-                            return content.strip()
+                async with self._semaphore:
+                    await _RATE_LIMITER.wait()
+                    async with session.post(
+                        f"{self.config.api_base_url}/chat/completions",
+                        headers=headers,
+                        data=body,
+                        timeout=timeout,
+                    ) as response:
+                        _RATE_LIMITER.update(response.headers)
+
+                        if response.status == 200:
+                            async for chunk in self._read_event_stream(response):
+                                streamed = True
+                                yield chunk
+                            return
+
+                        elif response.status == 401:
+                            logger.error("Invalid API key for OpenRouter")
+                            return
+
+                        elif response.status in RETRYABLE_STATUSES:
+                            logger.warning(
+                                f"OpenRouter API returned status {response.status}, retrying..."
+                            )
+                            # Prefer the server's hint over our own backoff,
+                            # but never stall for longer than max_retry_delay
+                            retry_after = _parse_retry_after(
+                                response.headers.get("Retry-After")
+                            )
+                            if retry_after is not None:
+                                delay = min(retry_after, self.config.max_retry_delay)
+
                         else:
-                            logger.error("Invalid response format from OpenRouter API")
-                            return None
-
-                    elif response.status == 401:
-                        logger.error("Invalid API key for OpenRouter")
-                        return None
-
-                    elif response.status == 429:
-                        logger.warning("Rate limit exceeded, retrying...")
-                        if attempt < self.config.max_retries - 1:
-                            await asyncio.sleep(self.config.retry_delay * (2**attempt))
-                            continue
-
-                    else:
-                        error_text = await response.text()
-                        logger.error(
-                            f"OpenRouter API error {response.status}: {error_text}"
-                        )
-
-            except aiohttp.ClientError as e:
+                            error_text = await response.text()
+                            logger.error(
+                                f"OpenRouter API error {response.status}: {error_text}"
+                            )
+                            return
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Retrying after output was produced would duplicate it
+                if streamed:
+                    raise
                 logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
 
             if attempt < self.config.max_retries - 1:
-                await asyncio.sleep(self.config.retry_delay * (2**attempt))
+                await asyncio.sleep(delay)
 
-        return None
+    async def _read_event_stream(
+        self, response: aiohttp.ClientResponse
+    ) -> AsyncIterator[str]:
+        """Yield content deltas from an OpenRouter server-sent event stream."""
+        async for raw_line in response.content:
+            line = raw_line.strip()
+
+            # Blank lines separate events; lines starting with ":" are comments
+            if not line.startswith(b"data:"):
+                continue
+
+            data = line[len(b"data:") :].strip()
+            if data == b"[DONE]":
+                break
+
+            event = json_loads(data)
+            if "error" in event:
+                raise aiohttp.ClientPayloadError(
+                    f"OpenRouter stream error: {event['error']}"
+                )
+
+            choices = event.get("choices")
+            if choices:
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
 
     def _post_process_readme(self, content: str, repo_data: RepositoryData) -> str:
         """Post-process the generated README content."""
@@ -292,20 +504,14 @@ Generate a complete, professional README.md file:
             badges = self._generate_badges(repo_data)
             if badges:
                 # Insert badges after the title
-                lines = content.split("\n")
-                title_line = 0
-                for i, line in enumerate(lines):
-                    if line.startswith("# "):
-                        title_line = i
-                        break
-
-                lines.insert(title_line + 1, "")
-                lines.insert(title_line + 2, badges)
-                lines.insert(title_line + 3, "")
-                content = "\n".join(lines)
+                content = _TITLE_RE.sub(
+                    lambda match: f"{match.group(1)}\n\n{badges}\n",
+                    content,
+                    count=1,
+                )
 
         # Ensure proper spacing
-        content = content.replace("\n\n\n", "\n\n")
+        content = collapse_blank_lines(content)
 
         return content
 
@@ -353,6 +559,14 @@ Generate a complete, professional README.md file:
     async def generate_readme(self, repo_data: RepositoryData) -> Optional[str]:
         """Generate a comprehensive README.md file."""
         try:
+            # Unchanged repositories skip prompt assembly and the API call
+            readme_key = self._readme_cache_key(repo_data)
+            if self._cache:
+                cached = await self._cache.aget(readme_key)
+                if cached:
+                    logger.info("Using cached README")
+                    return cached
+
             logger.info("Creating analysis prompt...")
             prompt = self._create_analysis_prompt(repo_data)
 
@@ -366,12 +580,55 @@ Generate a complete, professional README.md file:
             logger.info("Post-processing README content...")
             final_content = self._post_process_readme(readme_content, repo_data)
 
+            if self._cache:
+                await self._cache.aset(
+                    readme_key, final_content, expire=self.config.cache_ttl
+                )
             return final_content
 
         except Exception as e:
             logger.error(f"Failed to generate README: {e}")
             return None
-        finally:
-            if self.session:
-                await self.session.close()
-                self.session = None
+
+    async def generate_readmes(
+        self, repos: List[RepositoryData]
+    ) -> List[Optional[str]]:
+        """Generate READMEs for several repositories concurrently.
+
+        Results are in the same order as repos, with None for every README
+        that could not be generated.
+        """
+        # Requests share the session and are bounded by the generator's semaphore
+        results = await asyncio.gather(
+            *(self.generate_readme(repo_data) for repo_data in repos),
+            return_exceptions=True,
+        )
+        return [
+            None if isinstance(result, BaseException) else result for result in results
+        ]
+
+    async def generate_readme_stream(
+        self, repo_data: RepositoryData
+    ) -> AsyncIterator[str]:
+        """Generate README content, yielding chunks as the model produces them.
+
+        Chunks are the raw model output; badges and other post-processing are
+        only applied by generate_readme.
+        """
+        prompt = self._create_analysis_prompt(repo_data)
+
+        cache_key = self._response_cache_key(prompt)
+        if self._cache:
+            cached = await self._cache.aget(cache_key)
+            if cached:
+                yield cached
+                return
+
+        buffer = io.StringIO()
+        async for chunk in self._stream_openrouter_api(prompt):
+            buffer.write(chunk)
+            yield chunk
+
+        content = buffer.getvalue().strip()
+        if self._cache and content:
+            await self._cache.aset(cache_key, content, expire=self.config.cache_ttl)
@@ -1,16 +1,120 @@
+import atexit
+import json
 import logging
+import os
+import queue
 import re
 import sys
-from typing import Optional
-from urllib.parse import urlparse
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the standard library
+    orjson = None
+
+# GitHub repository URL; captures owner and repository name (without ".git")
+GITHUB_URL_PATTERN = re.compile(
+    r"^https?://github\.com/([\w.-]+)/([\w.-]+?)(?:\.git)?/?$"
+)
+
+# Markdown helpers
+_MULTI_NL = re.compile(r"\n{3,}")
+_HEADER_RE = re.compile(r"^(#{2,6})\s+(.+)$", re.MULTILINE)
+_ANCHOR_NONWORD = re.compile(r"[^\w\s-]")
+_ANCHOR_SPACE = re.compile(r"[\s_]+")
+
+# Import statements, each language matched in one pass over the whole source
+_PY_IMPORT_RE = re.compile(
+    r"^[ \t]*(?:import[ \t]+(\w+(?:\.\w+)*)|from[ \t]+(\w+(?:\.\w+)*)[ \t]+import)",
+    re.MULTILINE,
+)
+_JS_IMPORT_RE = re.compile(
+    r'import[^\n]*from[ \t]+[\'"]([^\'"\n]+)[\'"]|require\([\'"]([^\'"\n]+)[\'"]\)'
+)
+
+# Characters not allowed in file names, mapped to underscores
+_SANITIZE_TRANS = str.maketrans(dict.fromkeys('<>:"/\\|?*', "_"))
+
+# Extensions of files that are not worth reading as text
+_BINARY_EXT = frozenset(
+    {
+        ".exe",
+        ".bin",
+        ".dll",
+        ".so",
+        ".dylib",
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".bmp",
+        ".svg",
+        ".ico",
+        ".mp3",
+        ".mp4",
+        ".avi",
+        ".mkv",
+        ".mov",
+        ".wav",
+        ".pdf",
+        ".doc",
+        ".docx",
+        ".xls",
+        ".xlsx",
+        ".ppt",
+        ".pptx",
+        ".zip",
+        ".tar",
+        ".gz",
+        ".rar",
+        ".7z",
+        ".class",
+        ".jar",
+        ".pyc",
+        ".pyo",
+        ".woff",
+        ".woff2",
+    }
+)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    """Serialize data to compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 
 def setup_logging(level: int = logging.INFO) -> None:
-    """Setup logging configuration."""
+    """Setup logging configuration.
+
+    Records are queued and written to stdout by a background thread, so
+    logging from coroutines never blocks the event loop on terminal I/O.
+    """
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    # Stopping the listener flushes any records still in the queue
+    atexit.register(listener.stop)
+
+    # The stream handler applies the full format on the listener thread
     logging.basicConfig(
         level=level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
+        format="%(message)s",
+        handlers=[QueueHandler(log_queue)],
     )
 
     # Reduce noise from aiohttp
@@ -23,44 +127,25 @@ def validate_github_url(url: str) -> bool:
     if not url:
         return False
 
-    # Regular expression for GitHub repository URLs
-    github_pattern = re.compile(r"^https?://github\.com/[\w\-\.]+/[\w\-\.]+/?$")
-
-    return bool(github_pattern.match(url.strip().rstrip("/")))
+    return bool(GITHUB_URL_PATTERN.match(url.strip()))
 
 
 def extract_repo_info(url: str) -> Optional[tuple[str, str]]:
     """Extract owner and repository name from GitHub URL."""
-    try:
-        parsed = urlparse(url.strip().rstrip("/"))
-        if parsed.netloc != "github.com":
-            return None
-
-        path_parts = parsed.path.strip("/").split("/")
-        if len(path_parts) >= 2:
-            return path_parts[0], path_parts[1]
-
-    except Exception:
-        pass
+    match = GITHUB_URL_PATTERN.match(url.strip())
+    if match:
+        return match.group(1), match.group(2)
 
     return None
 
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe file system usage."""
-    # Remove or replace invalid characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, "_")
-
-    # Remove leading/trailing whitespace and dots
-    filename = filename.strip(" .")
+    # Replace invalid characters, then trim whitespace and dots
+    filename = filename.translate(_SANITIZE_TRANS).strip(" .")
 
     # Ensure it's not empty
-    if not filename:
-        filename = "README"
-
-    return filename
+    return filename or "README"
 
 
 def truncate_text(text: str, max_length: int = 1000, suffix: str = "...") -> str:
@@ -100,86 +185,41 @@ def clean_markdown(content: str) -> str:
         cleaned_lines.append(line)
 
     # Join lines and normalize multiple newlines
-    cleaned = "\n".join(cleaned_lines)
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
+    cleaned = collapse_blank_lines("\n".join(cleaned_lines))
 
     return cleaned.strip()
 
 
+def collapse_blank_lines(content: str) -> str:
+    """Collapse any run of blank lines into a single blank line."""
+    return _MULTI_NL.sub("\n\n", content)
+
+
 def is_binary_file(filepath: str) -> bool:
     """Check if file is likely a binary file based on extension."""
-    binary_extensions = {
-        ".exe",
-        ".bin",
-        ".dll",
-        ".so",
-        ".dylib",
-        ".jpg",
-        ".jpeg",
-        ".png",
-        ".gif",
-        ".bmp",
-        ".svg",
-        ".ico",
-        ".mp3",
-        ".mp4",
-        ".avi",
-        ".mkv",
-        ".mov",
-        ".wav",
-        ".pdf",
-        ".doc",
-        ".docx",
-        ".xls",
-        ".xlsx",
-        ".ppt",
-        ".pptx",
-        ".zip",
-        ".tar",
-        ".gz",
-        ".rar",
-        ".7z",
-        ".class",
-        ".jar",
-        ".pyc",
-        ".pyo",
-    }
-
-    return any(filepath.lower().endswith(ext) for ext in binary_extensions)
+    # Every entry is a single suffix, so compound ones like ".tar.gz" are
+    # caught by their last part
+    return os.path.splitext(filepath)[1].lower() in _BINARY_EXT
 
 
 def extract_imports(code_content: str, file_extension: str) -> list[str]:
     """Extract import statements from code."""
-    imports = []
+    # Ordered set: keeps the first occurrence of each import in source order
+    imports: dict[str, None] = {}
 
     if file_extension == ".py":
         # Python imports
-        import_patterns = [
-            r"^import\s+(\w+(?:\.\w+)*)",
-            r"^from\s+(\w+(?:\.\w+)*)\s+import",
-        ]
-
-        for line in code_content.split("\n"):
-            line = line.strip()
-            for pattern in import_patterns:
-                match = re.match(pattern, line)
-                if match:
-                    imports.append(match.group(1))
-
+        pattern = _PY_IMPORT_RE
     elif file_extension in [".js", ".ts", ".jsx", ".tsx"]:
         # JavaScript/TypeScript imports
-        import_patterns = [
-            r'import.*from\s+[\'"]([^\'"]+)[\'"]',
-            r'require\([\'"]([^\'"]+)[\'"]\)',
-        ]
+        pattern = _JS_IMPORT_RE
+    else:
+        return []
 
-        for line in code_content.split("\n"):
-            line = line.strip()
-            for pattern in import_patterns:
-                matches = re.findall(pattern, line)
-                imports.extend(matches)
+    for match in pattern.finditer(code_content):
+        imports[match.group(1) or match.group(2)] = None
 
-    return list(set(imports))  # Remove duplicates
+    return list(imports)
 
 
 def detect_framework(files: list, file_contents: dict) -> Optional[str]:
@@ -231,7 +271,7 @@ def detect_framework(files: list, file_contents: dict) -> Optional[str]:
 def generate_table_of_contents(content: str) -> str:
     """Generate a table of contents from markdown headers."""
     toc_lines = []
-    headers = re.findall(r"^(#{2,6})\s+(.+)$", content, re.MULTILINE)
+    headers = _HEADER_RE.findall(content)
 
     for level_hash, title in headers:
         level = len(level_hash) - 1  # Convert ## to level 1, ### to level 2, etc.
@@ -239,8 +279,8 @@ def generate_table_of_contents(content: str) -> str:
 
         # Create anchor link
         anchor = title.lower()
-        anchor = re.sub(r"[^\w\s-]", "", anchor)
-        anchor = re.sub(r"[\s_]+", "-", anchor)
+        anchor = _ANCHOR_NONWORD.sub("", anchor)
+        anchor = _ANCHOR_SPACE.sub("-", anchor)
 
         toc_lines.append(f"{indent}- [{title}](#{anchor})")
 
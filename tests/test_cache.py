@@ -0,0 +1,77 @@
+import pytest
+
+from src.cache import DiskCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DiskCache(tmp_path / "cache" / "test.sqlite")
+    yield cache
+    cache.close()
+
+
+def test_round_trip(cache):
+    value = {"etag": '"abc"', "body": b"\x00\x01", "items": [1, 2]}
+    cache.set("key", value)
+    assert cache.get("key") == value
+
+
+def test_missing_key(cache):
+    assert cache.get("missing") is None
+
+
+def test_overwrite(cache):
+    cache.set("key", "old")
+    cache.set("key", "new")
+    assert cache.get("key") == "new"
+
+
+def test_expired_entry_is_removed(cache, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr("src.cache.time.time", lambda: now)
+    cache.set("key", "value", expire=10)
+    assert cache.get("key") == "value"
+
+    now += 11
+    assert cache.get("key") is None
+    rows = cache._connect().execute("SELECT COUNT(*) FROM cache").fetchone()
+    assert rows == (0,)
+
+
+@pytest.mark.parametrize("expire", [0, -1])
+def test_non_positive_expiry_is_not_stored(cache, expire):
+    cache.set("key", "value", expire=expire)
+    assert cache.get("key") is None
+
+    cache.set("key", "old", expire=60)
+    cache.set("key", "new", expire=expire)
+    assert cache.get("key") is None
+
+
+def test_set_prunes_expired_entries(cache, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr("src.cache.time.time", lambda: now)
+    cache.set("short", 1, expire=10)
+    cache.set("forever", 2)
+
+    now += 11
+    cache.set("other", 3)
+    keys = {row[0] for row in cache._connect().execute("SELECT key FROM cache")}
+    assert keys == {"forever", "other"}
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "test.sqlite"
+    first = DiskCache(path)
+    first.set("key", "value")
+    first.close()
+
+    second = DiskCache(path)
+    assert second.get("key") == "value"
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_async_round_trip(cache):
+    await cache.aset("key", [1, 2, 3], expire=60)
+    assert await cache.aget("key") == [1, 2, 3]
@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+
+from src.config import Config
+from src.github_analyzer import GitHubAnalyzer
+
+
+def blob(path, sha=None, size=10):
+    return {"type": "blob", "path": path, "sha": sha or path, "size": size}
+
+
+@pytest.fixture
+def config():
+    config = Config()
+    config.use_cache = False
+    return config
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Hands out queued responses and records every GET with its headers."""
+
+    closed = False
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append((url, dict(headers or {})))
+        return self.responses.pop(0)
+
+
+def stub_tree(analyzer, tree):
+    async def get_tree(owner, repo, ref="HEAD"):
+        return tree
+
+    analyzer._get_tree = get_tree
+
+
+class TestAnalyzeDirectoryStructure:
+    @pytest.mark.asyncio
+    async def test_skips_failed_and_empty_blobs(self, config):
+        analyzer = GitHubAnalyzer(config)
+        stub_tree(
+            analyzer,
+            [blob("a.py"), blob("timeout.py"), blob("binary.py"), blob("b.py")],
+        )
+
+        async def get_blob(owner, repo, sha, path):
+            if path == "timeout.py":
+                raise asyncio.TimeoutError()
+            if path == "binary.py":
+                return None
+            return f"# {path}"
+
+        analyzer._get_blob = get_blob
+        files = await analyzer._analyze_directory_structure("owner", "repo")
+
+        assert [f.path for f in files] == ["a.py", "b.py"]
+        assert files[0].content == "# a.py"
+
+    @pytest.mark.asyncio
+    async def test_stops_at_max_files_and_cancels_pending(self, config):
+        config.max_files = 3
+        analyzer = GitHubAnalyzer(config)
+        paths = [f"file{i:02}.py" for i in range(12)]
+        stub_tree(analyzer, [blob(path) for path in paths])
+
+        # Serialize downloads like the request semaphore does
+        semaphore = asyncio.Semaphore(1)
+        started = []
+
+        async def get_blob(owner, repo, sha, path):
+            async with semaphore:
+                started.append(path)
+                await asyncio.sleep(0.01)
+                if path == "file02.py":
+                    raise asyncio.TimeoutError()
+                return None if path == "file03.py" else "content"
+
+        analyzer._get_blob = get_blob
+        files = await analyzer._analyze_directory_structure("owner", "repo")
+
+        assert [f.path for f in files] == ["file00.py", "file01.py", "file04.py"]
+
+        # Let the cancellations run, then nothing may be left pending
+        await asyncio.sleep(0.05)
+        assert not set(started) & set(paths[6:])
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    @pytest.mark.asyncio
+    async def test_filters_by_depth_type_extension_and_size(self, config):
+        config.max_file_size = 100
+        analyzer = GitHubAnalyzer(config)
+        stub_tree(
+            analyzer,
+            [
+                {"type": "tree", "path": "src", "sha": "t"},
+                blob("src/a/b/ok.py"),
+                blob("src/a/b/c/too_deep.py"),
+                blob("Dockerfile"),
+                blob("image.png"),
+                blob("notes.unknown"),
+                blob("big.py", size=101),
+            ],
+        )
+        requested = []
+
+        async def get_blob(owner, repo, sha, path):
+            requested.append(path)
+            return "content"
+
+        analyzer._get_blob = get_blob
+
+        files = await analyzer._analyze_directory_structure("owner", "repo")
+        assert [f.path for f in files] == ["src/a/b/ok.py", "Dockerfile"]
+
+        requested.clear()
+        files = await analyzer._analyze_directory_structure(
+            "owner", "repo", max_level=1
+        )
+        assert requested == ["Dockerfile"]
+
+
+class TestResponseCache:
+    @pytest.fixture
+    def cached_config(self, config, tmp_path):
+        config.use_cache = True
+        config.cache_dir = str(tmp_path)
+        return config
+
+    @pytest.mark.asyncio
+    async def test_mutable_endpoint_is_revalidated(self, cached_config):
+        analyzer = GitHubAnalyzer(cached_config)
+        analyzer.session = FakeSession(
+            [
+                FakeResponse(200, b'{"name": "repo"}', {"ETag": '"v1"'}),
+                FakeResponse(304),
+            ]
+        )
+
+        try:
+            first = await analyzer._get_repository_info("owner", "repo")
+            second = await analyzer._get_repository_info("owner", "repo")
+        finally:
+            analyzer._cache.close()
+
+        assert first == second == {"name": "repo"}
+        (_, first_headers), (_, second_headers) = analyzer.session.requests
+        assert "If-None-Match" not in first_headers
+        assert second_headers["If-None-Match"] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_cached_blob_skips_the_network(self, cached_config):
+        analyzer = GitHubAnalyzer(cached_config)
+        analyzer.session = FakeSession(
+            [FakeResponse(200, b"print('hi')\n", {"ETag": '"sha"'})]
+        )
+
+        try:
+            first = await analyzer._get_blob("owner", "repo", "abc123", "a.py")
+            second = await analyzer._get_blob("owner", "repo", "abc123", "a.py")
+        finally:
+            analyzer._cache.close()
+
+        assert first == second == "print('hi')\n"
+        assert len(analyzer.session.requests) == 1
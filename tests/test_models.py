@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from src.models import FileData, LanguageStats, RepositoryData, _format_structure
+
+
+def format_structure_recursive(structure, indent=0):
+    """Reference implementation the iterative formatter replaced."""
+    lines = []
+    prefix = "  " * indent
+
+    for key, value in sorted(structure.items()):
+        if isinstance(value, dict):
+            lines.append(f"{prefix}{key}/")
+            lines.append(format_structure_recursive(value, indent + 1))
+        else:
+            lines.append(f"{prefix}{key} {value}")
+
+    return "\n".join(lines)
+
+
+def random_structure(rng, depth=0):
+    structure = {}
+    for _ in range(rng.randint(1, 5)):
+        name = f"entry{rng.randint(0, 30)}"
+        if depth < 4 and rng.random() < 0.3:
+            structure[name] = random_structure(rng, depth + 1)
+        else:
+            structure[name] = f"({rng.randint(0, 5000)} bytes)"
+    return structure
+
+
+def make_repository(files, languages=None):
+    return RepositoryData(
+        name="repo",
+        full_name="owner/repo",
+        description="",
+        url="https://github.com/owner/repo",
+        clone_url="https://github.com/owner/repo.git",
+        language="Python",
+        languages=LanguageStats(languages=languages or {}, total_lines=0),
+        stars=0,
+        forks=0,
+        open_issues=0,
+        created_at="",
+        updated_at="",
+        pushed_at="",
+        project_type="Python Project",
+        files=files,
+        readme_content="",
+        license_content="",
+        has_wiki=False,
+        has_issues=False,
+        has_projects=False,
+    )
+
+
+def make_file(path, size=1):
+    name = path.rsplit("/", 1)[-1]
+    extension = "." + name.rsplit(".", 1)[-1] if "." in name else ""
+    return FileData(path=path, name=name, extension=extension, size=size, content="")
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_format_structure_matches_recursive(seed):
+    structure = random_structure(random.Random(seed))
+    assert _format_structure(structure) == format_structure_recursive(structure)
+
+
+def test_file_structure():
+    repo = make_repository(
+        [make_file("src/app.py", 10), make_file("main.py", 5), make_file("src/x/y.py")]
+    )
+    assert repo.get_file_structure() == (
+        "main.py (5 bytes)\n"
+        "src/\n"
+        "  app.py (10 bytes)\n"
+        "  x/\n"
+        "    y.py (1 bytes)"
+    )
+    assert repo.get_file_structure() is repo.get_file_structure()
+
+
+def test_language_summary_sorted_by_share():
+    repo = make_repository([], {"Go": 20.0, "Python": 75.5, "Shell": 4.5})
+    assert repo.get_language_summary() == (
+        "- Python: 75.5%\n- Go: 20.0%\n- Shell: 4.5%"
+    )
+
+
+def test_fingerprint_tracks_pushes_and_manifest():
+    repo = make_repository([make_file("a.py", 3)])
+    same = make_repository([make_file("a.py", 3)])
+    assert repo.fingerprint() == same.fingerprint()
+
+    pushed = make_repository([make_file("a.py", 3)])
+    pushed.pushed_at = "2024-01-01T00:00:00Z"
+    assert pushed.fingerprint() != repo.fingerprint()
+
+    resized = make_repository([make_file("a.py", 4)])
+    assert resized.fingerprint() != repo.fingerprint()
@@ -0,0 +1,296 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import aiohttp
+import pytest
+
+from src.config import Config
+from src import readme_generator
+from src.models import LanguageStats, RepositoryData
+from src.readme_generator import ReadmeGenerator, _parse_retry_after
+
+
+class FakeResponse:
+    """Minimal stand-in for aiohttp.ClientResponse streaming raw lines."""
+
+    def __init__(self, lines):
+        self.content = self._iter_lines(lines)
+
+    @staticmethod
+    async def _iter_lines(lines):
+        for line in lines:
+            yield line
+
+
+class FakeStatusResponse(FakeResponse):
+    """Response with a status, headers and an SSE body, usable with async with."""
+
+    def __init__(self, status, lines=(), headers=None):
+        super().__init__(lines)
+        self.status = status
+        self.headers = headers or {}
+
+    async def text(self):
+        return "error"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Hands out queued responses and records every POST."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.posts = []
+
+    def post(self, url, **kwargs):
+        self.posts.append(url)
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+
+def sse(*chunks):
+    """Encode content deltas as an OpenRouter event stream."""
+    lines = [
+        f'data: {{"choices":[{{"delta":{{"content":"{chunk}"}}}}]}}\n'.encode()
+        for chunk in chunks
+    ]
+    return [*lines, b"data: [DONE]\n"]
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    session = FakeSession([])
+
+    async def get_session():
+        return session
+
+    monkeypatch.setattr(readme_generator, "_get_session", get_session)
+    return session
+
+
+def make_repository():
+    return RepositoryData(
+        name="repo",
+        full_name="owner/repo",
+        description="A repository",
+        url="https://github.com/owner/repo",
+        clone_url="https://github.com/owner/repo.git",
+        language="Python",
+        languages=LanguageStats(languages={"Python": 100.0}, total_lines=0),
+        stars=1,
+        forks=0,
+        open_issues=0,
+        created_at="",
+        updated_at="",
+        pushed_at="2024-01-01T00:00:00Z",
+        project_type="Python Project",
+        files=[],
+        readme_content="",
+        license_content="",
+        has_wiki=False,
+        has_issues=False,
+        has_projects=False,
+    )
+
+
+@pytest.fixture
+def generator():
+    config = Config()
+    config.use_cache = False
+    return ReadmeGenerator(config)
+
+
+async def read_all(generator, lines):
+    return [chunk async for chunk in generator._read_event_stream(FakeResponse(lines))]
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert _parse_retry_after("3") == 3.0
+        assert _parse_retry_after("1.5") == 1.5
+
+    def test_negative_seconds_are_clamped(self):
+        assert _parse_retry_after("-5") == 0.0
+
+    def test_http_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        delay = _parse_retry_after(format_datetime(retry_at, usegmt=True))
+        assert 25 <= delay <= 30
+
+    def test_http_date_in_the_past(self):
+        assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    @pytest.mark.parametrize("value", [None, "", "soon", "Mon, 99 Foo 2015"])
+    def test_missing_or_garbage(self, value):
+        assert _parse_retry_after(value) is None
+
+
+class TestReadEventStream:
+    @pytest.mark.asyncio
+    async def test_yields_content_deltas(self, generator):
+        lines = [
+            b": OPENROUTER PROCESSING\n",
+            b"\n",
+            b'data: {"choices":[{"delta":{"content":"# Ti"}}]}\n',
+            b"\n",
+            b'data: {"choices":[{"delta":{"role":"assistant"}}]}\n',
+            b'data: {"choices":[{"delta":{"content":"tle"}}]}\n',
+        ]
+        assert await read_all(generator, lines) == ["# Ti", "tle"]
+
+    @pytest.mark.asyncio
+    async def test_stops_at_done(self, generator):
+        lines = [
+            b'data: {"choices":[{"delta":{"content":"a"}}]}\n',
+            b"data: [DONE]\n",
+            b'data: {"choices":[{"delta":{"content":"b"}}]}\n',
+        ]
+        assert await read_all(generator, lines) == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_error_event_raises(self, generator):
+        lines = [
+            b'data: {"choices":[{"delta":{"content":"a"}}]}\n',
+            b'data: {"error":{"message":"overloaded"}}\n',
+        ]
+        with pytest.raises(aiohttp.ClientPayloadError, match="overloaded"):
+            await read_all(generator, lines)
+
+
+class TestReadmeCache:
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_prompt_and_request(
+        self, tmp_path, fake_session, monkeypatch
+    ):
+        config = Config()
+        config.cache_dir = str(tmp_path)
+        config.include_badges = False
+        fake_session.responses = [FakeStatusResponse(200, sse("# repo\\n", "Body"))]
+
+        prompts = []
+        original = ReadmeGenerator._create_analysis_prompt
+
+        def counting_prompt(self, repo_data):
+            prompts.append(repo_data.name)
+            return original(self, repo_data)
+
+        monkeypatch.setattr(ReadmeGenerator, "_create_analysis_prompt", counting_prompt)
+
+        async with ReadmeGenerator(config) as generator:
+            first = await generator.generate_readme(make_repository())
+            second = await generator.generate_readme(make_repository())
+
+        assert first == second == "# repo\nBody"
+        assert prompts == ["repo"]
+        assert len(fake_session.posts) == 1
+
+    @pytest.mark.asyncio
+    async def test_new_push_rebuilds_prompt(self, tmp_path, fake_session):
+        config = Config()
+        config.cache_dir = str(tmp_path)
+        config.include_badges = False
+        fake_session.responses = [
+            FakeStatusResponse(200, sse("# one")),
+            FakeStatusResponse(200, sse("# two")),
+        ]
+        pushed = make_repository()
+        pushed.pushed_at = "2024-02-01T00:00:00Z"
+        pushed.description = "A changed repository"
+
+        async with ReadmeGenerator(config) as generator:
+            assert await generator.generate_readme(make_repository()) == "# one"
+            assert await generator.generate_readme(pushed) == "# two"
+
+        assert len(fake_session.posts) == 2
+
+
+class TestStreamRetries:
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(readme_generator.asyncio, "sleep", fake_sleep)
+        return delays
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_capped(self, generator, fake_session, sleeps):
+        generator.config.max_retry_delay = 5
+        fake_session.responses = [
+            FakeStatusResponse(503, headers={"Retry-After": "86400"}),
+            FakeStatusResponse(200, sse("# Title")),
+        ]
+
+        assert await generator._call_openrouter_api("prompt") == "# Title"
+        assert sleeps == [5]
+        assert len(fake_session.posts) == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honored_below_cap(
+        self, generator, fake_session, sleeps
+    ):
+        fake_session.responses = [
+            FakeStatusResponse(429, headers={"Retry-After": "2"}),
+            FakeStatusResponse(200, sse("ok")),
+        ]
+
+        assert await generator._call_openrouter_api("prompt") == "ok"
+        assert sleeps == [2.0]
+
+    @pytest.mark.asyncio
+    async def test_connection_error_is_retried(self, generator, fake_session, sleeps):
+        fake_session.responses = [
+            aiohttp.ClientConnectionError("reset"),
+            FakeStatusResponse(200, sse("ok")),
+        ]
+
+        assert await generator._call_openrouter_api("prompt") == "ok"
+        assert len(fake_session.posts) == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [400, 401, 404])
+    async def test_client_errors_are_not_retried(
+        self, generator, fake_session, sleeps, status
+    ):
+        fake_session.responses = [FakeStatusResponse(status)]
+
+        assert await generator._call_openrouter_api("prompt") is None
+        assert len(fake_session.posts) == 1
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, generator, fake_session, sleeps):
+        generator.config.max_retries = 3
+        fake_session.responses = [FakeStatusResponse(503) for _ in range(3)]
+
+        assert await generator._call_openrouter_api("prompt") is None
+        assert len(fake_session.posts) == 3
+        assert len(sleeps) == 2
+
+    @pytest.mark.asyncio
+    async def test_no_retry_once_output_was_streamed(
+        self, generator, fake_session, sleeps
+    ):
+        fake_session.responses = [
+            FakeStatusResponse(
+                200,
+                [
+                    b'data: {"choices":[{"delta":{"content":"partial"}}]}\n',
+                    b'data: {"error":{"message":"overloaded"}}\n',
+                ],
+            ),
+            FakeStatusResponse(200, sse("full")),
+        ]
+
+        with pytest.raises(aiohttp.ClientPayloadError):
+            await generator._call_openrouter_api("prompt")
+        assert len(fake_session.posts) == 1
@@ -0,0 +1,79 @@
+import pytest
+
+from src.utils import (
+    GITHUB_URL_PATTERN,
+    extract_imports,
+    extract_repo_info,
+    validate_github_url,
+)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://github.com/owner/repo",
+        "https://github.com/owner/repo/",
+        "https://github.com/owner/repo.git",
+        "https://github.com/owner/repo.git/",
+        "http://github.com/owner/repo",
+        "  https://github.com/owner/repo  ",
+    ],
+)
+def test_extract_repo_info(url):
+    assert extract_repo_info(url) == ("owner", "repo")
+    assert validate_github_url(url)
+
+
+def test_extract_repo_info_keeps_dots_and_dashes():
+    url = "https://github.com/my-org/some.repo-name.git"
+    assert extract_repo_info(url) == ("my-org", "some.repo-name")
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "",
+        "https://gitlab.com/owner/repo",
+        "https://github.com/owner",
+        "https://github.com/owner/repo/tree/main",
+        "github.com/owner/repo",
+    ],
+)
+def test_invalid_urls(url):
+    assert extract_repo_info(url) is None
+    assert not validate_github_url(url)
+
+
+def test_pattern_does_not_capture_git_suffix():
+    match = GITHUB_URL_PATTERN.match("https://github.com/owner/repo.git")
+    assert match.groups() == ("owner", "repo")
+
+
+def test_extract_python_imports():
+    code = (
+        "import os\n"
+        "from a.b import c\n"
+        "    import sys\n"
+        "import os.path\n"
+        "x = 'import no'\n"
+    )
+    assert sorted(extract_imports(code, ".py")) == ["a.b", "os", "os.path", "sys"]
+
+
+def test_extract_js_imports():
+    code = "import x from 'react';\nconst fs = require(\"fs\");\n"
+    assert sorted(extract_imports(code, ".ts")) == ["fs", "react"]
+
+
+def test_extract_imports_deduplicates():
+    code = "import os\nimport os\n"
+    assert extract_imports(code, ".py") == ["os"]
+
+
+def test_extract_imports_unknown_extension():
+    assert extract_imports("import os", ".rb") == []
+
+
+def test_extract_imports_keeps_source_order():
+    code = "import sys\nimport os\nfrom json import loads\nimport sys\n"
+    assert extract_imports(code, ".py") == ["sys", "os", "json"]